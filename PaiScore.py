@@ -1,6 +1,12 @@
 import datetime
+import logging
+import sys
+from bisect import bisect_left
+from collections import deque
 from math import pow
 
+logger = logging.getLogger(__name__)
+
 # ----------------------------------------------------------------------------
 # 1. DEFINING THE SCORING RULES AND BADGES
 # ----------------------------------------------------------------------------
@@ -42,10 +48,16 @@ BADGE_LEVELS = {
     (95, 100): {"name": "Ambassador", "perks": "First access, spotlight ads, bonus coins"}
 }
 
+# Badge tiers as parallel lists sorted by upper bound, for bisect lookups
+_BADGE_THRESHOLDS = [max_score for (_, max_score) in sorted(BADGE_LEVELS)]
+_BADGES = [BADGE_LEVELS[score_range] for score_range in sorted(BADGE_LEVELS)]
+
 # NEW: Configuration for the Age Experience Score
 # This score is a bonus based on account tenure.
 MAX_AGE_SCORE_CONTRIBUTION = 20  # Max points a user can get from age alone.
 
+STATUS_DIVIDER = "=" * 40
+
 
 # ----------------------------------------------------------------------------
 # 2. CORE SYSTEM CLASSES
@@ -53,12 +65,13 @@ MAX_AGE_SCORE_CONTRIBUTION = 20  # Max points a user can get from age alone.
 
 class UserAction:
     """Represents a single action taken by a user."""
+    __slots__ = ("action_type", "date", "base_score", "decay_rate")
 
-    def __init__(self, action_type, date=None):
+    def __init__(self, action_type, date):
         if action_type not in ACTION_WEIGHTS:
             raise ValueError(f"Action type '{action_type}' is not defined.")
         self.action_type = action_type
-        self.date = date or datetime.date.today()
+        self.date = date  # Simulated date; handle_user_action defaults it to the system date
         self.base_score = ACTION_WEIGHTS[action_type]["score"]
         self.decay_rate = ACTION_WEIGHTS[action_type]["decay"]
 
@@ -76,11 +89,12 @@ class UserAction:
 
 class User:
     """Manages a user's state, including their action history and PAI score."""
+    __slots__ = ("name", "creation_date", "action_history", "score", "badge", "last_action_date", "age_score_component")
 
     def __init__(self, name, creation_date):
         self.name = name
         self.creation_date = creation_date  # NEW: Track when the user was created
-        self.action_history = []
+        self.action_history = deque()  # In date order, so expired actions are popped from the front
         self.score = 0
         self.badge = None
         self.last_action_date = None
@@ -89,10 +103,19 @@ class User:
     def add_action(self, action_type, date):
         """Adds a new action to the user's history."""
         action = UserAction(action_type, date)
-        self.action_history.append(action)
+        if self.action_history and date < self.action_history[-1].date:
+            # Back-dated action: insert it after every action on or before its date
+            i = len(self.action_history)
+            while i and self.action_history[i - 1].date > date:
+                i -= 1
+            self.action_history.insert(i, action)
+        else:
+            self.action_history.append(action)
         if not self.last_action_date or date > self.last_action_date:
             self.last_action_date = date
-        print(f"  -> Action Added: {self.name} performed '{action_type}' on {date}. Base score: {action.base_score}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("  -> Action Added: %s performed '%s' on %s. Base score: %s",
+                         self.name, action_type, date, action.base_score)
 
 
 class PaiSystem:
@@ -113,12 +136,8 @@ class PaiSystem:
 
     def _get_badge_for_score(self, score):
         """Maps a numerical score to a user-facing badge."""
-        for (min_score, max_score), badge_info in BADGE_LEVELS.items():
-            if min_score <= score <= max_score:
-                return badge_info
-        if score > 100: return BADGE_LEVELS[(95, 100)]
-        if score < 0: return BADGE_LEVELS[(0, 29)]
-        return None
+        # Whole points decide the tier, so 29.99 is still "New"; out-of-range scores fall into the nearest one
+        return _BADGES[bisect_left(_BADGE_THRESHOLDS, max(0, min(100, int(score))))]
 
     def _calculate_age_score(self, user):
         """Calculates the Paicoin Experience score based on account age."""
@@ -145,7 +164,8 @@ class PaiSystem:
 
         # 1. Calculate score from recent actions
         cutoff_date = self.current_date - datetime.timedelta(days=self.history_days)
-        user.action_history = [action for action in user.action_history if action.date >= cutoff_date]
+        while user.action_history and user.action_history[0].date < cutoff_date:
+            user.action_history.popleft()
         action_score = sum(action.get_effective_score(self.current_date) for action in user.action_history)
 
         # 2. Calculate the age experience score
@@ -161,22 +181,24 @@ class PaiSystem:
     def advance_time(self, days=1):
         """Simulates the passage of time and updates all users."""
         self.current_date += datetime.timedelta(days=days)
-        print(f"\n--- {days} day(s) later ({self.current_date}) ---")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n--- %d day(s) later (%s) ---", days, self.current_date)
         for user_name in self.users:
             self.update_user_score(user_name)
 
     def print_user_status(self, user_name):
         """Displays the current status of a user."""
         user = self.get_or_create_user(user_name)
-        print("=" * 40)
-        print(f"User Status: {user.name} on {self.current_date}")
-        print(f"  Age Score Component: {user.age_score_component:.2f} / {MAX_AGE_SCORE_CONTRIBUTION}")
-        print(f"  Final Score: {user.score:.2f}")
-        if user.badge:
-            print(f"  Badge: {user.badge['name']} ({user.badge['perks']})")
-        else:
-            print("  Badge: None")
-        print("=" * 40)
+        badge = f"{user.badge['name']} ({user.badge['perks']})" if user.badge else "None"
+        # Built as one string so the report is a single write
+        sys.stdout.write(
+            f"{STATUS_DIVIDER}\n"
+            f"User Status: {user.name} on {self.current_date}\n"
+            f"  Age Score Component: {user.age_score_component:.2f} / {MAX_AGE_SCORE_CONTRIBUTION}\n"
+            f"  Final Score: {user.score:.2f}\n"
+            f"  Badge: {badge}\n"
+            f"{STATUS_DIVIDER}\n"
+        )
 
 
 # ----------------------------------------------------------------------------
@@ -204,6 +226,8 @@ def main():
     """
     Main function to run the PAI Score simulation.
     """
+    # The demo narrates every action, so show the debug trace on stdout
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
     pai_system = PaiSystem()
     sim_start_date = datetime.date(2025, 7, 18)
     pai_system.current_date = sim_start_date
@@ -1,6 +1,11 @@
 import datetime
+import logging
+import sys
+from collections import deque
 from math import pow
 
+logger = logging.getLogger(__name__)
+
 # -----------------------------
 # 1. ACTION_WEIGHTS: Defines scoring, decay, targeting, and role permissions for each action type
 # -----------------------------
@@ -41,6 +46,8 @@ BADGE_LEVELS = {
 
 MAX_AGE_SCORE_CONTRIBUTION = 20
 
+STATUS_DIVIDER = "=" * 45
+
 # -----------------------------
 # 2. CLASSES: UserAction, User, PaiSystem (with detailed prints/comments)
 # -----------------------------
@@ -50,14 +57,17 @@ class UserAction:
     Represents a single user event, and computes (with decay) how
     much it currently affects the user's score.
     """
-    def __init__(self, action_type, date=None, actor=True):
+    __slots__ = ("action_type", "date", "actor", "weights")
+
+    def __init__(self, action_type, date, actor=True):
         if action_type not in ACTION_WEIGHTS:
             raise ValueError(f"Action type '{action_type}' is not defined.")
         self.action_type = action_type
-        self.date = date or datetime.date.today()
+        self.date = date  # Always given; wall-clock "today" has no place in a simulation
         self.actor = actor
         self.weights = ACTION_WEIGHTS[action_type]
-        print(f"[UserAction] {action_type} recorded for {'actor' if actor else 'target'} on {self.date}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[UserAction] %s recorded for %s on %s", action_type, "actor" if actor else "target", self.date)
 
     def get_effective_score(self, current_date):
         """
@@ -71,7 +81,9 @@ class UserAction:
             score = base_score * pow(1 - decay, max(days_old, 0))
         else:
             score = base_score
-        print(f"    [UserAction] {self.action_type} ({'actor' if self.actor else 'target'}) worth {score:.2f} after {days_old} day(s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("    [UserAction] %s (%s) worth %.2f after %d day(s)",
+                         self.action_type, "actor" if self.actor else "target", score, days_old)
         return score
 
     def __repr__(self):
@@ -80,24 +92,37 @@ class UserAction:
 
 class User:
     """Represents a user/advertiser in the platform's trust system."""
+    __slots__ = (
+        "name", "type", "creation_date", "action_history",
+        "score", "badge", "age_score_component", "last_action_date",
+    )
+
     def __init__(self, name, creation_date, user_type):
         self.name = name
         self.type = user_type
         self.creation_date = creation_date
-        self.action_history = []
+        self.action_history = deque()  # Kept in date order, so expired actions are at the front
         self.score = 0
         self.badge = None
         self.age_score_component = 0
         self.last_action_date = None
-        print(f"[User] Created: {name} ({user_type}), joined {creation_date}")
+        logger.debug("[User] Created: %s (%s), joined %s", name, user_type, creation_date)
 
     def add_action(self, action_type, date, actor=True):
         """Record an action for this user as actor or target."""
         action = UserAction(action_type, date, actor)
-        self.action_history.append(action)
+        if self.action_history and date < self.action_history[-1].date:
+            # Back-dated action: insert it after every action on or before its date
+            i = len(self.action_history)
+            while i and self.action_history[i - 1].date > date:
+                i -= 1
+            self.action_history.insert(i, action)
+        else:
+            self.action_history.append(action)
         if not self.last_action_date or date > self.last_action_date:
             self.last_action_date = date
-        print(f"    [User] {self.name}: Action '{action_type}' added ({'actor' if actor else 'target'})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("    [User] %s: Action '%s' added (%s)", self.name, action_type, "actor" if actor else "target")
 
 class PaiSystem:
     """
@@ -108,11 +133,11 @@ class PaiSystem:
         self.history_days = history_days
         self.inactivity_days = inactivity_days
         self.current_date = datetime.date.today()
-        print("[PaiSystem] Initialized.")
+        logger.debug("[PaiSystem] Initialized.")
 
     def get_or_create_user(self, name, user_type, creation_date=None):
         if name not in self.users:
-            print(f"[PaiSystem] Creating {user_type} '{name}'")
+            logger.debug("[PaiSystem] Creating %s '%s'", user_type, name)
             self.users[name] = User(name, creation_date or self.current_date, user_type)
         else:
             if user_type and self.users[name].type != user_type:
@@ -123,7 +148,8 @@ class PaiSystem:
         for (min_score, max_score), badge_info in BADGE_LEVELS.items():
             if min_score <= score <= max_score:
                 return badge_info
-        return BADGE_LEVELS[(95,100)] if score > 100 else BADGE_LEVELS[(0,29)]
+        # Scores are clamped to 0–100 before this, so only a fractional score between tiers gets here
+        return BADGE_LEVELS[(0,29)]
 
     def _calculate_age_score(self, user):
         # Age boosts trust: older accounts get a passive bonus
@@ -138,41 +164,47 @@ class PaiSystem:
         else:
             age_multiplier = 0.15
         user.age_score_component = MAX_AGE_SCORE_CONTRIBUTION * age_multiplier
-        print(f"    [PaiSystem] {user.name} account age: {account_age_years:.2f}y -> age bonus {user.age_score_component:.2f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("    [PaiSystem] %s account age: %.2fy -> age bonus %.2f",
+                         user.name, account_age_years, user.age_score_component)
         return user.age_score_component
 
     def update_user_score(self, user_name):
         user = self.users[user_name]
         cutoff = self.current_date - datetime.timedelta(days=self.history_days)
-        print(f"[PaiSystem] Calculating score for {user.name}. Considering actions since {cutoff}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[PaiSystem] Calculating score for %s. Considering actions since %s", user.name, cutoff)
 
         # Remove stale actions (older than history_days)
-        user.action_history = [a for a in user.action_history if a.date >= cutoff]
+        while user.action_history and user.action_history[0].date < cutoff:
+            user.action_history.popleft()
         score = sum(a.get_effective_score(self.current_date) for a in user.action_history)
         age_score = self._calculate_age_score(user)
         final_score = max(0, min(100, score + age_score))
         user.score = final_score
         user.badge = self._get_badge_for_score(user.score)
-        print(f"    [PaiSystem] {user.name}: Total score {user.score:.2f}, badge: {user.badge['name']}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("    [PaiSystem] %s: Total score %.2f, badge: %s\n", user.name, user.score, user.badge["name"])
 
     def advance_time(self, days=1):
         # Move system forward N days and recalc all
         self.current_date += datetime.timedelta(days=days)
-        print(f"\n=== [PaiSystem] Advancing time by {days} day(s). New date: {self.current_date} ===")
+        logger.debug("\n=== [PaiSystem] Advancing time by %d day(s). New date: %s ===", days, self.current_date)
         for uname in self.users:
             self.update_user_score(uname)
 
     def print_user_status(self, user_name):
         user = self.users[user_name]
-        print("="*45)
-        print(f"User Status: {user.name} ({user.type}) on {self.current_date}")
-        print(f"  Age Score: {user.age_score_component:.2f} / {MAX_AGE_SCORE_CONTRIBUTION}")
-        print(f"  Final Score: {user.score:.2f}")
-        if user.badge:
-            print(f"  Badge: {user.badge['name']} ({user.badge['perks']})")
-        else:
-            print("  Badge: None")
-        print("="*45)
+        badge = f"{user.badge['name']} ({user.badge['perks']})" if user.badge else "None"
+        # Built as one string so the report is a single write
+        sys.stdout.write(
+            f"{STATUS_DIVIDER}\n"
+            f"User Status: {user.name} ({user.type}) on {self.current_date}\n"
+            f"  Age Score: {user.age_score_component:.2f} / {MAX_AGE_SCORE_CONTRIBUTION}\n"
+            f"  Final Score: {user.score:.2f}\n"
+            f"  Badge: {badge}\n"
+            f"{STATUS_DIVIDER}\n"
+        )
 
 # -----------------------------
 # 3. Action Handler: Processes actions and updates users
@@ -187,15 +219,17 @@ def handle_user_action(
 
     info = ACTION_WEIGHTS.get(action_type)
     if not info:
-        print(f"[handle_user_action] Unknown action: {action_type}. Skipped.")
+        logger.debug("[handle_user_action] Unknown action: %s. Skipped.", action_type)
         return
 
     allowed_for = info["allowed_for"]
     actor = pai_system.get_or_create_user(user_name, user_type, creation_date)
-    print(f"\n[handle_user_action] '{actor.name}' is performing '{action_type}'.")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\n[handle_user_action] '%s' is performing '%s'.", actor.name, action_type)
 
     if actor.type not in allowed_for:
-        print(f"  [handle_user_action] Action '{action_type}' not allowed for {actor.type}. Skipped.")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("  [handle_user_action] Action '%s' not allowed for %s. Skipped.", action_type, actor.type)
         return actor
 
     actor.add_action(action_type, action_date, actor=True)
@@ -204,43 +238,51 @@ def handle_user_action(
     # Register effect for target, if the action has one.
     if info.get("affects_target"):
         if not target_user_name:
-            print("  [handle_user_action] Target user missing for action. Skipped.")
+            logger.debug("  [handle_user_action] Target user missing for action. Skipped.")
             return actor
         target = pai_system.get_or_create_user(target_user_name, target_user_type, target_creation_date)
-        print(f"  [handle_user_action] '{target.name}' is the target of '{action_type}'.")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("  [handle_user_action] '%s' is the target of '%s'.", target.name, action_type)
         target.add_action(action_type, action_date, actor=False)
         pai_system.update_user_score(target.name)
     return actor
 
+# Demo scenario dates and user types
+SIM_START_DATE = datetime.date(2025, 7, 18)
+KAVITA_CREATION_DATE = datetime.date(2015, 1, 1)
+COMMON = "common"
+ADVERTISER = "advertiser"
+
 # -----------------------------
 # 4. Demo/Simulation: See flow, prints, and comments in action
 # -----------------------------
 def main():
+    # The demo walks through every step, so show the debug trace on stdout
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
     print("[Demo] Starting PaiScore simulation...")
     pai_system = PaiSystem()
-    sim_start_date = datetime.date(2025, 7, 18)
-    pai_system.current_date = sim_start_date
-    print(f"[Demo] System date set to {sim_start_date}")
+    pai_system.current_date = SIM_START_DATE
+    print(f"[Demo] System date set to {SIM_START_DATE}")
 
     # Scenario 1: User and advertiser login, engagement, dual scoring for like
     print("\n[Scenario 1] Trupti logs in and likes Sai's ad.")
-    handle_user_action(pai_system, "Trupti", "LOGIN", user_type="common", creation_date=sim_start_date)
-    handle_user_action(pai_system, "Sai", "LOGIN", user_type="advertiser", creation_date=sim_start_date)
-    handle_user_action(pai_system, "Trupti", "AD_LIKED", user_type="common", target_user_name="Sai", target_user_type="advertiser")
+    handle_user_action(pai_system, "Trupti", "LOGIN", user_type=COMMON, creation_date=SIM_START_DATE)
+    handle_user_action(pai_system, "Sai", "LOGIN", user_type=ADVERTISER, creation_date=SIM_START_DATE)
+    handle_user_action(pai_system, "Trupti", "AD_LIKED", user_type=COMMON, target_user_name="Sai", target_user_type=ADVERTISER)
     pai_system.print_user_status("Trupti")
     pai_system.print_user_status("Sai")
 
     # Scenario 2: Advertiser gets engagement after posting ad
     print("\n[Scenario 2] Kavita (advertiser) posts an ad and gets a like.")
-    handle_user_action(pai_system, "Kavita", "AD_POSTED_PAI", user_type="advertiser", creation_date=datetime.date(2015,1,1))
-    handle_user_action(pai_system, "Sravan", "AD_LIKED", user_type="common", target_user_name="Kavita", target_user_type="advertiser")
+    handle_user_action(pai_system, "Kavita", "AD_POSTED_PAI", user_type=ADVERTISER, creation_date=KAVITA_CREATION_DATE)
+    handle_user_action(pai_system, "Sravan", "AD_LIKED", user_type=COMMON, target_user_name="Kavita", target_user_type=ADVERTISER)
     pai_system.print_user_status("Kavita")
     pai_system.print_user_status("Sravan")
 
     # Scenario 3: Sravan comments and follows
     print("\n[Scenario 3] Sravan comments and follows Kavita.")
-    handle_user_action(pai_system, "Sravan", "POSITIVE_COMMENT", user_type="common", target_user_name="Kavita", target_user_type="advertiser")
-    handle_user_action(pai_system, "Sravan", "FOLLOWED_USER", user_type="common", target_user_name="Kavita", target_user_type="advertiser")
+    handle_user_action(pai_system, "Sravan", "POSITIVE_COMMENT", user_type=COMMON, target_user_name="Kavita", target_user_type=ADVERTISER)
+    handle_user_action(pai_system, "Sravan", "FOLLOWED_USER", user_type=COMMON, target_user_name="Kavita", target_user_type=ADVERTISER)
     pai_system.print_user_status("Kavita")
     pai_system.print_user_status("Sravan")
 
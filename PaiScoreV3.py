@@ -1,5 +1,8 @@
 import datetime
+import sys
+from bisect import bisect_left, insort
 from math import pow
+from operator import attrgetter
 
 # 1. ACTION_WEIGHTS holds rules for: scoring, decay, permissions, targets, delay penalties
 ACTION_WEIGHTS = {
@@ -46,8 +49,14 @@ BADGE_LEVELS = {
     (95, 100): {"name": "Ambassador", "perks": "First access, spotlight ads, bonus coins"}
 }
 
+# Badge tiers as parallel lists sorted by upper bound, for bisect lookups
+_BADGE_THRESHOLDS = [max_score for (_, max_score) in sorted(BADGE_LEVELS)]
+_BADGES = [BADGE_LEVELS[score_range] for score_range in sorted(BADGE_LEVELS)]
+
 MAX_AGE_SCORE_CONTRIBUTION = 20
 
+STATUS_DIVIDER = "=" * 45
+
 # ----------------------------
 # Classes for actions, users, and the PaiSystem.
 # ----------------------------
@@ -56,11 +65,15 @@ class UserAction:
     Stores an action with metadata for scoring.
     Will use delay_days to further decrease its value if delay_factor is defined for this action type.
     """
-    def __init__(self, action_type, date=None, actor=True, delay_days=0):
+    __slots__ = ("action_type", "date", "actor", "weights", "delay_days")
+
+    def __init__(self, action_type, date, actor=True, delay_days=0):
+        # date is required; handle_user_action fills in the system's current date,
+        # which is the only "now" that makes sense in a simulation
         if action_type not in ACTION_WEIGHTS:
             raise ValueError(f"Action type '{action_type}' is not defined.")
         self.action_type = action_type
-        self.date = date or datetime.date.today()
+        self.date = date
         self.actor = actor  # actor=True: performed the action; False: recipient/target
         self.weights = ACTION_WEIGHTS[action_type]
         self.delay_days = delay_days
@@ -91,6 +104,11 @@ class UserAction:
 
 class User:
     """Tracks the user's profile and all their actions."""
+    __slots__ = (
+        "name", "type", "creation_date", "action_history",
+        "score", "badge", "age_score_component", "last_action_date",
+    )
+
     def __init__(self, name, creation_date, user_type):
         self.name = name
         self.type = user_type  # 'common' or 'advertiser'
@@ -103,7 +121,11 @@ class User:
 
     def add_action(self, action_type, date, actor=True, delay_days=0):
         action = UserAction(action_type, date, actor, delay_days)
-        self.action_history.append(action)
+        if not self.action_history or action.date >= self.action_history[-1].date:
+            self.action_history.append(action)
+        else:
+            # Back-dated action: keep the history sorted by date
+            insort(self.action_history, action, key=attrgetter("date"))
         if not self.last_action_date or date > self.last_action_date:
             self.last_action_date = date
 
@@ -128,12 +150,8 @@ class PaiSystem:
         return self.users[name]
 
     def _get_badge_for_score(self, score):
-        for (min_score, max_score), badge_info in BADGE_LEVELS.items():
-            if min_score <= score <= max_score:
-                return badge_info
-        if score > 100: return BADGE_LEVELS[(95,100)]
-        if score < 0: return BADGE_LEVELS[(0,29)]
-        return None
+        # Whole points decide the tier; out-of-range scores fall into the nearest one
+        return _BADGES[bisect_left(_BADGE_THRESHOLDS, max(0, min(100, int(score))))]
 
     def _calculate_age_score(self, user):
         # Older accounts get more trust
@@ -152,9 +170,11 @@ class PaiSystem:
 
     def update_user_score(self, user_name):
         user = self.users[user_name]
-        # Only recent actions (by history_days) count
+        # Only recent actions (by history_days) count. The history is sorted by date,
+        # so expired actions are a prefix that can be dropped in place
         cutoff = self.current_date - datetime.timedelta(days=self.history_days)
-        user.action_history = [a for a in user.action_history if a.date >= cutoff]
+        if user.action_history and user.action_history[0].date < cutoff:
+            del user.action_history[:bisect_left(user.action_history, cutoff, key=attrgetter("date"))]
         # Score sum and apply age bonus
         score = sum(a.get_effective_score(self.current_date) for a in user.action_history)
         age_score = self._calculate_age_score(user)
@@ -174,15 +194,16 @@ class PaiSystem:
     def print_user_status(self, user_name):
         # Outputs a summary report for the user for the current system date
         user = self.users[user_name]
-        print("="*45)
-        print(f"User Status: {user.name} ({user.type}) on {self.current_date}")
-        print(f"  Age Score: {user.age_score_component:.2f} / {MAX_AGE_SCORE_CONTRIBUTION}")
-        print(f"  Final Score: {user.score:.2f}")
-        if user.badge:
-            print(f"  Badge: {user.badge['name']} ({user.badge['perks']})")
-        else:
-            print("  Badge: None")
-        print("="*45)
+        badge = f"{user.badge['name']} ({user.badge['perks']})" if user.badge else "None"
+        # Built as one string so the report is a single write
+        sys.stdout.write(
+            f"{STATUS_DIVIDER}\n"
+            f"User Status: {user.name} ({user.type}) on {self.current_date}\n"
+            f"  Age Score: {user.age_score_component:.2f} / {MAX_AGE_SCORE_CONTRIBUTION}\n"
+            f"  Final Score: {user.score:.2f}\n"
+            f"  Badge: {badge}\n"
+            f"{STATUS_DIVIDER}\n"
+        )
 
 def handle_user_action(
     pai_system, user_name, action_type, user_type=None, action_date=None, creation_date=None,
@@ -218,19 +239,24 @@ def handle_user_action(
         pai_system.update_user_score(target.name)
     return actor
 
+# Demo scenario dates and user types
+SIM_START_DATE = datetime.date(2025, 7, 18)
+KAVITA_CREATION_DATE = datetime.date(2015, 1, 1)
+COMMON = "common"
+ADVERTISER = "advertiser"
+
 def main():
     pai_system = PaiSystem()
-    sim_start_date = datetime.date(2025, 7, 18)
-    pai_system.current_date = sim_start_date
+    pai_system.current_date = SIM_START_DATE
 
     # ----------------------------
     # Scenario 1: Dual login & cross-like (see instant and delayed scoring)
     # ----------------------------
     print("\n[Scenario 1] Trupti logs in and likes Sai's ad.")
-    handle_user_action(pai_system, "Trupti", "LOGIN", user_type="common", creation_date=sim_start_date)
-    handle_user_action(pai_system, "Sai", "LOGIN", user_type="advertiser", creation_date=sim_start_date)
-    handle_user_action(pai_system, "Trupti", "AD_LIKED", user_type="common",
-                       target_user_name="Sai", target_user_type="advertiser")
+    handle_user_action(pai_system, "Trupti", "LOGIN", user_type=COMMON, creation_date=SIM_START_DATE)
+    handle_user_action(pai_system, "Sai", "LOGIN", user_type=ADVERTISER, creation_date=SIM_START_DATE)
+    handle_user_action(pai_system, "Trupti", "AD_LIKED", user_type=COMMON,
+                       target_user_name="Sai", target_user_type=ADVERTISER)
     pai_system.print_user_status("Trupti")
     pai_system.print_user_status("Sai")
 
@@ -238,9 +264,9 @@ def main():
     # Scenario 2: Advertiser posts an ad, another user likes ad instantly
     # ----------------------------
     print("\n[Scenario 2] Kavita (advertiser) posts an ad and gets a like.")
-    handle_user_action(pai_system, "Kavita", "AD_POSTED_PAI", user_type="advertiser", creation_date=datetime.date(2015,1,1))
-    handle_user_action(pai_system, "Sravan", "AD_LIKED", user_type="common",
-                       target_user_name="Kavita", target_user_type="advertiser")
+    handle_user_action(pai_system, "Kavita", "AD_POSTED_PAI", user_type=ADVERTISER, creation_date=KAVITA_CREATION_DATE)
+    handle_user_action(pai_system, "Sravan", "AD_LIKED", user_type=COMMON,
+                       target_user_name="Kavita", target_user_type=ADVERTISER)
     pai_system.print_user_status("Kavita")
     pai_system.print_user_status("Sravan")
 
@@ -248,10 +274,10 @@ def main():
     # Scenario 3: Sravan leaves a comment and follows Kavita; both have a positive effect
     # ----------------------------
     print("\n[Scenario 3] Sravan comments and follows Kavita.")
-    handle_user_action(pai_system, "Sravan", "POSITIVE_COMMENT", user_type="common",
-                       target_user_name="Kavita", target_user_type="advertiser")
-    handle_user_action(pai_system, "Sravan", "FOLLOWED_USER", user_type="common",
-                       target_user_name="Kavita", target_user_type="advertiser")
+    handle_user_action(pai_system, "Sravan", "POSITIVE_COMMENT", user_type=COMMON,
+                       target_user_name="Kavita", target_user_type=ADVERTISER)
+    handle_user_action(pai_system, "Sravan", "FOLLOWED_USER", user_type=COMMON,
+                       target_user_name="Kavita", target_user_type=ADVERTISER)
     pai_system.print_user_status("Kavita")
     pai_system.print_user_status("Sravan")
 
@@ -1,5 +1,19 @@
 import datetime
-from math import pow
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from enum import IntEnum
+from functools import lru_cache
+from math import exp, log, log1p
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; scoring falls back to plain NumPy
+    njit = prange = None
 
 # 1. ACTION_WEIGHTS holds rules for: scoring, decay, permissions, targets, delay penalties
 ACTION_WEIGHTS = {
@@ -37,6 +51,52 @@ ACTION_WEIGHTS = {
     "INACTIVITY": {"score": -3.0, "decay": 0.0, "allowed_for": ["common", "advertiser"], "affects_target": False}
 }
 
+# Bit per user type, so "allowed_for" checks are a single bitwise AND
+USER_TYPE_BITS = {"common": 1, "advertiser": 2}
+
+class ActionWeight(NamedTuple):
+    """One ACTION_WEIGHTS entry with every optional key resolved to its default."""
+    type_id: int  # Position in ACTION_WEIGHTS; per-action data stores this small int
+    score: float
+    target_score: float
+    decay: float
+    delay_factor: float
+    # log(1 - decay) and log(delay_factor), so decay and delay penalties are exp(log * days)
+    log_decay: float
+    log_delay: float
+    allowed_mask: int
+    affects_target: bool
+
+def _action_weight(type_id, weights):
+    decay = weights.get("decay", 0)
+    delay_factor = weights.get("delay_factor", 1.0)  # If not set, no delay penalty
+    return ActionWeight(
+        type_id=type_id,
+        score=weights.get("score", 0),
+        target_score=weights.get("target_score", 0),
+        decay=decay,
+        delay_factor=delay_factor,
+        log_decay=log1p(-decay) if decay > 0 else 0.0,
+        log_delay=log(delay_factor) if delay_factor < 1.0 else 0.0,
+        allowed_mask=sum(USER_TYPE_BITS[user_type] for user_type in weights["allowed_for"]),
+        affects_target=weights.get("affects_target", False),
+    )
+
+# Action types numbered in definition order, so per-action data can be stored as small ints
+ActionType = IntEnum("ActionType", list(ACTION_WEIGHTS), start=0)
+
+# ACTION_WEIGHTS resolved per action type; indexed by ActionType
+ACTION_TABLE = [_action_weight(ActionType[action_type], weights) for action_type, weights in ACTION_WEIGHTS.items()]
+NUM_ACTION_TYPES = len(ACTION_TABLE)
+
+def _as_action_type(action_type):
+    """The ActionType for an ActionType or its name; None for anything else, including plain ints."""
+    if type(action_type) is ActionType:
+        return action_type
+    if isinstance(action_type, str):
+        return ActionType.__members__.get(action_type)
+    return None
+
 # Badge tiers based on PAI score
 BADGE_LEVELS = {
     (0, 29): {"name": "New", "perks": "No PAI coin trade, limited ads"},
@@ -46,64 +106,244 @@ BADGE_LEVELS = {
     (95, 100): {"name": "Ambassador", "perks": "First access, spotlight ads, bonus coins"}
 }
 
+# Badge tiers as parallel lists sorted by lower bound, for bisect lookups
+_BADGE_MINIMUMS = [min_score for (min_score, _) in sorted(BADGE_LEVELS)]
+_BADGES = [BADGE_LEVELS[score_range] for score_range in sorted(BADGE_LEVELS)]
+
 MAX_AGE_SCORE_CONTRIBUTION = 20
 
+STATUS_DIVIDER = "=" * 45
+
+# Account age tiers: accounts at least _AGE_THRESHOLDS_YEARS[i - 1] years old get _AGE_MULTIPLIERS[i]
+_AGE_THRESHOLDS_YEARS = np.array([2.0, 5.0, 8.0])
+_AGE_MULTIPLIERS = np.array([0.15, 0.3, 0.4, 0.5])
+
+# Longest history window (in days) the precomputed decay table covers
+MAX_HISTORY_DAYS = 365
+
+# Daily decay rates indexed by action type id
+ACTION_DECAY_RATES = np.array([weights.decay for weights in ACTION_TABLE], dtype=np.float64)
+
+# DECAY_POWERS[type_id, days_old] == (1 - decay) ** days_old, built once instead of calling pow per action
+DECAY_POWERS = np.power(1.0 - ACTION_DECAY_RATES[:, np.newaxis], np.arange(MAX_HISTORY_DAYS + 1))
+
+# Stored base scores and the decay table are int16 fixed-point numbers: base scores
+# scaled by BASE_SCORE_SCALE, decay powers by DECAY_POWER_SCALE. Their products are
+# summed as int64 and divided by SCORE_SCALE once per user. Action type ids are int8.
+BASE_SCORE_SCALE = 1 << 8
+DECAY_POWER_SCALE = 1 << 14
+SCORE_SCALE = BASE_SCORE_SCALE * DECAY_POWER_SCALE
+if max(max(abs(weights.score), abs(weights.target_score)) for weights in ACTION_TABLE) * BASE_SCORE_SCALE > np.iinfo(np.int16).max:
+    raise ValueError("ACTION_WEIGHTS scores are too large for the int16 fixed-point representation.")
+if NUM_ACTION_TYPES - 1 > np.iinfo(np.int8).max:
+    raise ValueError("ACTION_WEIGHTS has too many action types for int8 type ids.")
+DECAY_POWERS_FIXED = np.round(DECAY_POWERS * DECAY_POWER_SCALE).astype(np.int16)
+
+# A user's decayed history is summed into one bucket per action type for gains and one
+# for losses (bucket type_id and NUM_ACTION_TYPES + type_id). Every action in a bucket
+# decays at the same rate, so moving time forward just scales each bucket.
+NUM_SCORE_BUCKETS = 2 * NUM_ACTION_TYPES
+# BUCKET_DECAY_POWERS[bucket, days] == DECAY_POWERS[bucket's action type, days]
+BUCKET_DECAY_POWERS = np.vstack([DECAY_POWERS, DECAY_POWERS])
+
+def _bucket_ids(type_ids, base_scores):
+    # Works on single actions and on arrays of them alike
+    return type_ids + NUM_ACTION_TYPES * (base_scores < 0)
+
+def _stack_histories(users, counts):
+    """
+    The first counts[i] actions of each user's history, stacked into flat
+    (date, base score, action type id) arrays, one user after another.
+    """
+    dates = np.concatenate([
+        np.frombuffer(user.action_dates, dtype=np.int32)[:count] for user, count in zip(users, counts)
+    ])
+    base_scores = np.concatenate([
+        np.frombuffer(user.action_base_scores, dtype=np.int16)[:count] for user, count in zip(users, counts)
+    ])
+    type_ids = np.concatenate([
+        np.frombuffer(user.action_type_ids, dtype=np.int8)[:count] for user, count in zip(users, counts)
+    ])
+    return dates, base_scores, type_ids
+
+def _score_user_buckets_numpy(offsets, dates, base_scores, type_ids, current_ord):
+    """
+    Every action's decayed score as of current_ord, summed per score bucket in
+    SCORE_SCALE fixed-point units. Takes many users' stacked histories, user i
+    owning the actions in offsets[i]:offsets[i + 1], and returns one row of
+    buckets per user.
+    """
+    n_users = len(offsets) - 1
+    user_ids = np.repeat(np.arange(n_users), np.diff(offsets))
+    raw_scores = base_scores.astype(np.int64) * DECAY_POWERS_FIXED[type_ids, np.maximum(current_ord - dates, 0)]
+    return np.bincount(
+        user_ids * NUM_SCORE_BUCKETS + _bucket_ids(type_ids, base_scores),
+        weights=raw_scores, minlength=n_users * NUM_SCORE_BUCKETS,
+    ).reshape(n_users, NUM_SCORE_BUCKETS)
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _score_user_buckets(offsets, dates, base_scores, type_ids, current_ord):
+        # Same as _score_user_buckets_numpy, fused into one pass with no temporary arrays.
+        # Users own disjoint slices of the stacked history and their own row of
+        # buckets, so they are scored in parallel without any shared writes.
+        # DECAY_POWERS_FIXED is read as a global so Numba freezes it into the compiled
+        # kernel as a constant, specializing it to this ACTION_WEIGHTS table. The bucket
+        # is _bucket_ids written out inline.
+        n_users = offsets.shape[0] - 1
+        buckets = np.zeros((n_users, NUM_SCORE_BUCKETS), dtype=np.int64)
+        for user in prange(n_users):
+            for i in range(offsets[user], offsets[user + 1]):
+                days_old = max(current_ord - dates[i], 0)
+                bucket = type_ids[i] + NUM_ACTION_TYPES * (base_scores[i] < 0)
+                buckets[user, bucket] += np.int64(base_scores[i]) * DECAY_POWERS_FIXED[type_ids[i], days_old]
+        return buckets
+else:
+    _score_user_buckets = _score_user_buckets_numpy
+
+def _month_ordinal(date):
+    return date.year * 12 + date.month
+
+@lru_cache(maxsize=None)
+def _age_multiplier(total_months):
+    """Trust multiplier for an account total_months old; only a few hundred ages ever occur."""
+    return float(_age_multipliers(np.asarray(total_months)))
+
+def _age_multipliers(total_months):
+    # Reaching a threshold moves an account up a tier, hence side="right"
+    return _AGE_MULTIPLIERS[np.searchsorted(_AGE_THRESHOLDS_YEARS, total_months / 12.0, side="right")]
+
+def _final_scores(gains, losses, current_scores, age_scores):
+    """
+    New scores from the decayed gains and losses, for one user or arrays of users.
+    Gains are scaled down as the current score rises and penalties hurt more for
+    high-score users; the age bonus is added and the result capped at 0–100.
+    """
+    scores = gains * ((100 - current_scores) / 100) + losses * (current_scores / 100) + age_scores
+    if isinstance(scores, float):
+        return max(0, min(100, scores))  # NumPy's call overhead would dominate for one user
+    return np.clip(scores, 0, 100)
+
+def _badges_for(scores):
+    """
+    Badge for each score in a list: the last tier whose (whole-point) minimum the score
+    reaches, so 29.99 is still "New". Out-of-range scores fall into the nearest tier.
+    """
+    return [_BADGES[max(bisect_right(_BADGE_MINIMUMS, score), 1) - 1] for score in scores]
+
 # ----------------------------
 # Classes for actions, users, and the PaiSystem.
 # ----------------------------
 class UserAction:
     """
-    Stores an action with metadata for scoring.
+    Plain record of a single action, for debugging and as the floating-point reference
+    for scoring; User histories store actions column-wise and never create these.
     Will use delay_days to further decrease its value if delay_factor is defined for this action type.
     """
-    def __init__(self, action_type, date=None, actor=True, delay_days=0):
-        if action_type not in ACTION_WEIGHTS:
+    __slots__ = ("action_type", "date", "date_ord", "actor", "weights", "delay_days")
+
+    def __init__(self, action_type, date, actor=True, delay_days=0):
+        resolved = _as_action_type(action_type)
+        if resolved is None:
             raise ValueError(f"Action type '{action_type}' is not defined.")
-        self.action_type = action_type
-        self.date = date or datetime.date.today()
+        self.action_type = resolved
+        self.date = date
+        self.date_ord = date.toordinal()  # Stored once, so scoring is plain int arithmetic
         self.actor = actor  # actor=True: performed the action; False: recipient/target
-        self.weights = ACTION_WEIGHTS[action_type]
+        self.weights = ACTION_TABLE[resolved]
         self.delay_days = delay_days
 
     def get_effective_score(self, current_date):
         """
         Score effective as of now, decayed by days_old and penalized for any delay spesified.
         """
-        days_old = (current_date - self.date).days
+        return self.get_effective_score_ord(current_date.toordinal())
+
+    def get_effective_score_ord(self, current_ord):
+        """
+        Same as get_effective_score, but takes the current date as a day ordinal
+        so callers scoring many actions convert it only once.
+        """
+        days_old = current_ord - self.date_ord
         # Score type: actor or target impact
-        score_key = "score" if self.actor else "target_score"
-        base_score = self.weights.get(score_key, 0)
-        decay = self.weights.get("decay", 0)
-        delay_factor = self.weights.get("delay_factor", 1.0)  # If not set, no delay penalty
-
-        # Temporal decay (older actions fade)
-        score = base_score
-        if decay > 0:
-            score *= pow(1 - decay, max(days_old, 0))
-        # Additional score reduction if there was a delay between related actions (e.g., like after ad posted)
-        if self.delay_days > 0 and delay_factor < 1.0:
-            score *= pow(delay_factor, self.delay_days)
-        return score
+        weights = self.weights
+        base_score = weights.score if self.actor else weights.target_score
+
+        # Temporal decay (older actions fade), plus an additional reduction if there was
+        # a delay between related actions (e.g., like after ad posted)
+        return base_score * exp(weights.log_decay * max(days_old, 0) + weights.log_delay * self.delay_days)
 
     def __repr__(self):
         who = "actor" if self.actor else "target"
-        return f"Action({self.action_type}, {self.date}, {who}, delay={self.delay_days})"
+        return f"Action({self.action_type.name}, {self.date}, {who}, delay={self.delay_days})"
 
 class User:
     """Tracks the user's profile and all their actions."""
+    __slots__ = (
+        "name", "type", "type_bits", "creation_date", "creation_month",
+        "action_dates", "action_base_scores", "action_type_ids",
+        "score_buckets", "score_cached_as_of",
+        "score", "badge", "age_score_component", "age_computed_for_month", "last_action_date",
+    )
+
     def __init__(self, name, creation_date, user_type):
         self.name = name
         self.type = user_type  # 'common' or 'advertiser'
+        self.type_bits = USER_TYPE_BITS.get(user_type, 0)  # Matched against ActionWeight.allowed_mask
         self.creation_date = creation_date
-        self.action_history = []
+        self.creation_month = _month_ordinal(creation_date)
+        # Action history kept column-wise (int32 date ordinal, int16 fixed-point base score,
+        # int8 action type id) and sorted by date, so scoring can run as a single
+        # vectorized pass and expired actions are always a prefix.
+        self.action_dates = array("i")
+        self.action_base_scores = array("h")
+        self.action_type_ids = array("b")
+        # Decayed history summed per score bucket as of the score_cached_as_of ordinal;
+        # new actions are added to it directly and advancing time rescales it,
+        # instead of rescanning the history
+        self.score_buckets = np.zeros(NUM_SCORE_BUCKETS)
+        self.score_cached_as_of = None
         self.score = 0
         self.badge = None
         self.age_score_component = 0
+        self.age_computed_for_month = None  # _month_ordinal of the date age_score_component was computed for
         self.last_action_date = None
 
-    def add_action(self, action_type, date, actor=True, delay_days=0):
-        action = UserAction(action_type, date, actor, delay_days)
-        self.action_history.append(action)
+    def add_action(self, action_type, date, actor=True, delay_days=0, weights=None):
+        # Callers that already looked up the action type's ACTION_TABLE entry pass it as weights
+        if weights is None:
+            type_id = _as_action_type(action_type)
+            if type_id is None:
+                raise ValueError(f"Action type '{action_type}' is not defined.")
+            weights = ACTION_TABLE[type_id]
+        type_id = weights.type_id
+        base_score = weights.score if actor else weights.target_score
+        # The delay penalty never changes, so fold it into the base score up front
+        if delay_days > 0:
+            base_score *= exp(weights.log_delay * delay_days)
+        base_score = round(base_score * BASE_SCORE_SCALE)
+        date_ord = date.toordinal()
+        cached_as_of = self.score_cached_as_of
+        if cached_as_of is not None and 0 <= cached_as_of - date_ord <= MAX_HISTORY_DAYS:
+            # Add it to the cached buckets as decayed up to the cached date, with the same
+            # fixed-point decay power a rebuild would use; if it is already out of the
+            # history window, the next update expires it again
+            bucket = _bucket_ids(type_id, base_score)
+            decay_power = DECAY_POWERS_FIXED[type_id, cached_as_of - date_ord] / DECAY_POWER_SCALE
+            self.score_buckets[bucket] += base_score / BASE_SCORE_SCALE * decay_power
+        else:
+            # Future-dated (or very old) actions can't go into the cache; rescan instead
+            self.score_cached_as_of = None
+        if not self.action_dates or date_ord >= self.action_dates[-1]:
+            self.action_dates.append(date_ord)
+            self.action_base_scores.append(base_score)
+            self.action_type_ids.append(type_id)
+        else:
+            # Back-dated action: insert it where it belongs to keep the history sorted
+            i = bisect_right(self.action_dates, date_ord)
+            self.action_dates.insert(i, date_ord)
+            self.action_base_scores.insert(i, base_score)
+            self.action_type_ids.insert(i, type_id)
         if not self.last_action_date or date > self.last_action_date:
             self.last_action_date = date
 
@@ -114,9 +354,35 @@ class PaiSystem:
     """
     def __init__(self, history_days=30, inactivity_days=7):
         self.users = {}
-        self.history_days = history_days
+        self.history_days = history_days  # Validated against MAX_HISTORY_DAYS
         self.inactivity_days = inactivity_days
-        self.current_date = datetime.date.today()
+        self.current_date = datetime.date.today()  # Also sets current_ord and current_month
+        # While batch_mode is on, new actions only mark their users dirty;
+        # scores are recomputed once per user by flush()
+        self.batch_mode = False
+        self.dirty_users = set()
+
+    @property
+    def current_date(self):
+        return self._current_date
+
+    @current_date.setter
+    def current_date(self, date):
+        # Scoring works on day and month ordinals; keep them in step with the date
+        self._current_date = date
+        self.current_ord = date.toordinal()
+        self.current_month = _month_ordinal(date)
+
+    @property
+    def history_days(self):
+        return self._history_days
+
+    @history_days.setter
+    def history_days(self, days):
+        # Decay powers are only tabulated for ages up to MAX_HISTORY_DAYS
+        if days > MAX_HISTORY_DAYS:
+            raise ValueError(f"history_days can be at most {MAX_HISTORY_DAYS}.")
+        self._history_days = days
 
     def get_or_create_user(self, name, user_type, creation_date=None):
         if name not in self.users:
@@ -128,26 +394,15 @@ class PaiSystem:
         return self.users[name]
 
     def _get_badge_for_score(self, score):
-        for (min_score, max_score), badge_info in BADGE_LEVELS.items():
-            if min_score <= score <= max_score:
-                return badge_info
-        if score > 100: return BADGE_LEVELS[(95,100)]
-        if score < 0: return BADGE_LEVELS[(0,29)]
-        return None
+        return _badges_for([score])[0]
 
     def _calculate_age_score(self, user):
-        # Older accounts get more trust
-        total_months = (self.current_date.year - user.creation_date.year) * 12 + (self.current_date.month - user.creation_date.month)
-        account_age_years = total_months / 12.0
-        if account_age_years >= 8:
-            age_multiplier = 0.5
-        elif account_age_years >= 5:
-            age_multiplier = 0.4
-        elif account_age_years >= 2:
-            age_multiplier = 0.3
-        else:
-            age_multiplier = 0.15
-        user.age_score_component = MAX_AGE_SCORE_CONTRIBUTION * age_multiplier
+        # Older accounts get more trust; account age only changes when the month does
+        month = self.current_month
+        if user.age_computed_for_month != month:
+            total_months = month - user.creation_month
+            user.age_score_component = MAX_AGE_SCORE_CONTRIBUTION * _age_multiplier(total_months)
+            user.age_computed_for_month = month
         return user.age_score_component
 
     # def update_user_score(self, user_name):
@@ -162,66 +417,210 @@ class PaiSystem:
     #     user.score = final_score
     #     user.badge = self._get_badge_for_score(user.score)
 
-    def update_user_score(self, user_name):
-    user = self.users[user_name]
-
-    # Remove actions older than the history window (e.g., 30 days)
-    cutoff = self.current_date - datetime.timedelta(days=self.history_days)
-    user.action_history = [a for a in user.action_history if a.date >= cutoff]
-
-    # Calculate age-based trust component (static bonus based on account age)
-    age_score = self._calculate_age_score(user)
-
-    # We'll modulate gains and losses based on current score
-    current_score = user.score  # This is their score *before* updating
+    def _drop_expired_actions(self, user, cutoff_ord):
+        # Remove actions older than the history window (e.g., 30 days)
+        if user.action_dates and user.action_dates[0] < cutoff_ord:
+            expired = bisect_left(user.action_dates, cutoff_ord)
+            del user.action_dates[:expired]
+            del user.action_base_scores[:expired]
+            del user.action_type_ids[:expired]
 
-    total_effective_score = 0  # Accumulated total from all actions
-
-    for action in user.action_history:
-        # Get action's decayed and delayed effective score
-        raw_score = action.get_effective_score(self.current_date)
-
-        if raw_score >= 0:
-            # If it's a gain: scale it down as user score increases
-            # Higher the current score, the lower the gain
-            adjusted = raw_score * ((100 - current_score) / 100)
-        else:
-            # If it's a penalty: make it hurt more for high-score users
-            # Higher the current score, the greater the loss
-            adjusted = raw_score * (current_score / 100)
-
-        total_effective_score += adjusted
-
-    # Final score = capped at 0–100
-    final_score = max(0, min(100, total_effective_score + age_score))
-
-    # Update user data
-    user.score = final_score
-    user.badge = self._get_badge_for_score(user.score)
+    def update_user_score(self, user_name):
+        current_ord = self.current_ord
+        self._update_user_score_fast(self.users[user_name], current_ord, current_ord - self.history_days)
 
+    def _score_cache_is_usable(self, user, current_ord):
+        # The cached buckets can be decayed forward as long as no action in them has
+        # been in the window for longer than history_days by now
+        cached_as_of = user.score_cached_as_of
+        return cached_as_of is not None and 0 <= current_ord - cached_as_of <= self.history_days
 
+    def _subtract_expired(self, buckets, cached_as_of, users, cutoff_ord):
+        """
+        Drop each user's expired actions, first subtracting what they contributed to
+        its row of buckets (updated in place) as of its cached_as_of day ordinal.
+        """
+        counts = [bisect_left(user.action_dates, cutoff_ord) for user in users]
+        if not any(counts):
+            return
+        user_ids = np.repeat(np.arange(len(users)), counts)
+        dates, base_scores, type_ids = _stack_histories(users, counts)
+        decay_powers = DECAY_POWERS_FIXED[type_ids, np.asarray(cached_as_of)[user_ids] - dates] / DECAY_POWER_SCALE
+        contributions = base_scores / BASE_SCORE_SCALE * decay_powers
+        buckets -= np.bincount(
+            user_ids * NUM_SCORE_BUCKETS + _bucket_ids(type_ids, base_scores),
+            weights=contributions, minlength=len(users) * NUM_SCORE_BUCKETS,
+        ).reshape(len(users), NUM_SCORE_BUCKETS)
+        for user in users:
+            self._drop_expired_actions(user, cutoff_ord)
+        # Don't carry rounding residue past an empty history
+        buckets[[not user.action_dates for user in users]] = 0.0
+
+    def _advance_score_cache(self, user, current_ord, cutoff_ord):
+        """
+        Bring a user's cached score buckets forward to current_ord without rescanning
+        the history: subtract the actions that expire, then decay every bucket by the
+        days elapsed. Returns False if there is no usable cache to advance.
+        """
+        if not self._score_cache_is_usable(user, current_ord):
+            return False
+        self._subtract_expired(
+            user.score_buckets[np.newaxis], [user.score_cached_as_of], [user], cutoff_ord
+        )
+        elapsed_days = current_ord - user.score_cached_as_of
+        if elapsed_days:
+            user.score_buckets *= BUCKET_DECAY_POWERS[:, elapsed_days]
+            user.score_cached_as_of = current_ord
+        return True
+
+    def _rebuild_score_cache(self, user, current_ord, cutoff_ord):
+        # Every action's decayed (and delay-penalized) score in one vectorized pass
+        self._drop_expired_actions(user, cutoff_ord)
+        offsets = np.array([0, len(user.action_dates)], dtype=np.int64)
+        user.score_buckets = _score_user_buckets(
+            offsets,
+            np.frombuffer(user.action_dates, dtype=np.int32),
+            np.frombuffer(user.action_base_scores, dtype=np.int16),
+            np.frombuffer(user.action_type_ids, dtype=np.int8),
+            current_ord,
+        )[0] / SCORE_SCALE
+        self._mark_score_cached(user, current_ord)
+
+    def _mark_score_cached(self, user, current_ord):
+        # Future-dated actions don't decay until their date arrives, so a cache that
+        # includes them can't simply be rescaled later; rebuild those users instead
+        has_future_actions = user.action_dates and user.action_dates[-1] > current_ord
+        user.score_cached_as_of = None if has_future_actions else current_ord
+
+    def _update_user_score_fast(self, user, current_ord, cutoff_ord):
+        # update_user_score with the day ordinals precomputed, for callers rescoring many users
+        if not self._advance_score_cache(user, current_ord, cutoff_ord):
+            self._rebuild_score_cache(user, current_ord, cutoff_ord)
+
+        # Calculate age-based trust component (static bonus based on account age)
+        age_score = self._calculate_age_score(user)
+
+        # Gains and losses are weighted by the score *before* updating
+        gains = float(user.score_buckets[:NUM_ACTION_TYPES].sum())
+        losses = float(user.score_buckets[NUM_ACTION_TYPES:].sum())
+        user.score = _final_scores(gains, losses, user.score, age_score)
+        user.badge = _badges_for([user.score])[0]
 
     def advance_time(self, days=1):
         """
         Move simulated system date N days forward, which will cause existing action
         scores to decay if they are older than before.
         """
-        self.current_date += datetime.timedelta(days=days)
-        for uname in self.users:
-            self.update_user_score(uname)
+        self.current_date = datetime.date.fromordinal(self.current_ord + days)
+        self.update_all_scores()
+        self.dirty_users.clear()
+
+    def update_all_scores(self):
+        """
+        Rescore every user at once, with each step run over arrays holding one row
+        per user. Cached score buckets are decayed forward together with one multiply;
+        users without a usable cache have their histories stacked into one flat table,
+        scored in a single vectorized pass and summed per user with np.bincount.
+        """
+        if not self.users:
+            return
+        current_ord = self.current_ord
+        cutoff_ord = current_ord - self.history_days
+        cached_users, stale_users = [], []
+        for user in self.users.values():
+            (cached_users if self._score_cache_is_usable(user, current_ord) else stale_users).append(user)
+
+        # Cached users first, then stale ones; every per-user array below follows this order
+        users = cached_users + stale_users
+        bucket_blocks = []
+        if cached_users:
+            buckets = np.stack([user.score_buckets for user in cached_users])
+            cached_as_of = np.array([user.score_cached_as_of for user in cached_users])
+
+            self._subtract_expired(buckets, cached_as_of, cached_users, cutoff_ord)
+            buckets *= BUCKET_DECAY_POWERS[:, current_ord - cached_as_of].T
+            for user, user_buckets in zip(cached_users, buckets):
+                user.score_buckets = user_buckets
+                user.score_cached_as_of = current_ord
+            bucket_blocks.append(buckets)
+        if stale_users:
+            bucket_blocks.append(self._rebuild_score_caches(stale_users, current_ord, cutoff_ord))
+
+        buckets = np.concatenate(bucket_blocks)
+        gains = buckets[:, :NUM_ACTION_TYPES].sum(axis=1)
+        losses = buckets[:, NUM_ACTION_TYPES:].sum(axis=1)
+
+        current_scores = np.array([user.score for user in users], dtype=np.float64)
+        month = self.current_month
+        creation_months = np.array([user.creation_month for user in users])
+        age_scores = MAX_AGE_SCORE_CONTRIBUTION * _age_multipliers(month - creation_months)
+        final_scores = _final_scores(gains, losses, current_scores, age_scores)
+
+        for user, final_score, badge, age_score in zip(
+            users, final_scores.tolist(), _badges_for(final_scores.tolist()), age_scores.tolist()
+        ):
+            user.score = final_score
+            user.badge = badge
+            user.age_score_component = age_score
+            user.age_computed_for_month = month
+
+    def _rebuild_score_caches(self, users, current_ord, cutoff_ord):
+        # _rebuild_score_cache for many users at once, as one flat vectorized pass;
+        # returns the new buckets with one row per user
+        for user in users:
+            self._drop_expired_actions(user, cutoff_ord)
+        counts = [len(user.action_dates) for user in users]
+        offsets = np.zeros(len(users) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        buckets = _score_user_buckets(offsets, *_stack_histories(users, counts), current_ord) / SCORE_SCALE
+        for user, user_buckets in zip(users, buckets):
+            user.score_buckets = user_buckets
+            self._mark_score_cached(user, current_ord)
+        return buckets
+
+    def request_score_update(self, user_name):
+        # Rescore now, or leave it to flush() when ingesting a batch
+        if self.batch_mode:
+            self.dirty_users.add(user_name)
+        else:
+            self.update_user_score(user_name)
+
+    def flush(self):
+        """Recompute the score of every user touched since the last flush."""
+        current_ord = self.current_ord
+        cutoff_ord = current_ord - self.history_days
+        for uname in self.dirty_users:
+            self._update_user_score_fast(self.users[uname], current_ord, cutoff_ord)
+        self.dirty_users.clear()
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer scoring for bulk ingestion: actions registered inside the block are
+        scored with a single pass per user when the block exits.
+        """
+        previous = self.batch_mode
+        self.batch_mode = True
+        try:
+            yield self
+        finally:
+            self.batch_mode = previous
+            if not previous:
+                self.flush()
 
     def print_user_status(self, user_name):
         # Outputs a summary report for the user for the current system date
         user = self.users[user_name]
-        print("="*45)
-        print(f"User Status: {user.name} ({user.type}) on {self.current_date}")
-        print(f"  Age Score: {user.age_score_component:.2f} / {MAX_AGE_SCORE_CONTRIBUTION}")
-        print(f"  Final Score: {user.score:.2f}")
-        if user.badge:
-            print(f"  Badge: {user.badge['name']} ({user.badge['perks']})")
-        else:
-            print("  Badge: None")
-        print("="*45)
+        badge = f"{user.badge['name']} ({user.badge['perks']})" if user.badge else "None"
+        # Built as one string so the report is a single write
+        sys.stdout.write(
+            f"{STATUS_DIVIDER}\n"
+            f"User Status: {user.name} ({user.type}) on {self.current_date}\n"
+            f"  Age Score: {user.age_score_component:.2f} / {MAX_AGE_SCORE_CONTRIBUTION}\n"
+            f"  Final Score: {user.score:.2f}\n"
+            f"  Badge: {badge}\n"
+            f"{STATUS_DIVIDER}\n"
+        )
 
 def handle_user_action(
     pai_system, user_name, action_type, user_type=None, action_date=None, creation_date=None,
@@ -237,39 +636,48 @@ def handle_user_action(
     if not action_date:
         action_date = pai_system.current_date
 
-    info = ACTION_WEIGHTS.get(action_type)
-    if not info:
+    # Action types may be given by name; everything past this point uses ActionType
+    action_type = _as_action_type(action_type)
+    if action_type is None:
         return
+    info = ACTION_TABLE[action_type]
 
-    allowed_for = info["allowed_for"]
     actor = pai_system.get_or_create_user(user_name, user_type, creation_date)
-    if actor.type not in allowed_for:
+    if not actor.type_bits & info.allowed_mask:
         return actor
 
-    actor.add_action(action_type, action_date, actor=True, delay_days=delay_days)
-    pai_system.update_user_score(actor.name)
+    actor.add_action(action_type, action_date, actor=True, delay_days=delay_days, weights=info)
+    pai_system.request_score_update(actor.name)
 
-    if info.get("affects_target"):
+    if info.affects_target:
         if not target_user_name:
             return actor
         target = pai_system.get_or_create_user(target_user_name, target_user_type, target_creation_date)
-        target.add_action(action_type, action_date, actor=False, delay_days=target_delay_days if target_delay_days else delay_days)
-        pai_system.update_user_score(target.name)
+        target.add_action(
+            action_type, action_date, actor=False,
+            delay_days=target_delay_days if target_delay_days else delay_days, weights=info,
+        )
+        pai_system.request_score_update(target.name)
     return actor
 
+# Demo scenario dates and user types
+SIM_START_DATE = datetime.date(2025, 7, 18)
+KAVITA_CREATION_DATE = datetime.date(2015, 1, 1)
+COMMON = "common"
+ADVERTISER = "advertiser"
+
 def main():
     pai_system = PaiSystem()
-    sim_start_date = datetime.date(2025, 7, 18)
-    pai_system.current_date = sim_start_date
+    pai_system.current_date = SIM_START_DATE
 
     # ----------------------------
     # Scenario 1: Dual login & cross-like (see instant and delayed scoring)
     # ----------------------------
     print("\n[Scenario 1] Trupti logs in and likes Sai's ad.")
-    handle_user_action(pai_system, "Trupti", "LOGIN", user_type="common", creation_date=sim_start_date)
-    handle_user_action(pai_system, "Sai", "LOGIN", user_type="advertiser", creation_date=sim_start_date)
-    handle_user_action(pai_system, "Trupti", "AD_LIKED", user_type="common",
-                       target_user_name="Sai", target_user_type="advertiser")
+    handle_user_action(pai_system, "Trupti", "LOGIN", user_type=COMMON, creation_date=SIM_START_DATE)
+    handle_user_action(pai_system, "Sai", "LOGIN", user_type=ADVERTISER, creation_date=SIM_START_DATE)
+    handle_user_action(pai_system, "Trupti", "AD_LIKED", user_type=COMMON,
+                       target_user_name="Sai", target_user_type=ADVERTISER)
     pai_system.print_user_status("Trupti")
     pai_system.print_user_status("Sai")
 
@@ -277,9 +685,9 @@ def main():
     # Scenario 2: Advertiser posts an ad, another user likes ad instantly
     # ----------------------------
     print("\n[Scenario 2] Kavita (advertiser) posts an ad and gets a like.")
-    handle_user_action(pai_system, "Kavita", "AD_POSTED_PAI", user_type="advertiser", creation_date=datetime.date(2015,1,1))
-    handle_user_action(pai_system, "Sravan", "AD_LIKED", user_type="common",
-                       target_user_name="Kavita", target_user_type="advertiser")
+    handle_user_action(pai_system, "Kavita", "AD_POSTED_PAI", user_type=ADVERTISER, creation_date=KAVITA_CREATION_DATE)
+    handle_user_action(pai_system, "Sravan", "AD_LIKED", user_type=COMMON,
+                       target_user_name="Kavita", target_user_type=ADVERTISER)
     pai_system.print_user_status("Kavita")
     pai_system.print_user_status("Sravan")
 
@@ -287,10 +695,10 @@ def main():
     # Scenario 3: Sravan leaves a comment and follows Kavita; both have a positive effect
     # ----------------------------
     print("\n[Scenario 3] Sravan comments and follows Kavita.")
-    handle_user_action(pai_system, "Sravan", "POSITIVE_COMMENT", user_type="common",
-                       target_user_name="Kavita", target_user_type="advertiser")
-    handle_user_action(pai_system, "Sravan", "FOLLOWED_USER", user_type="common",
-                       target_user_name="Kavita", target_user_type="advertiser")
+    handle_user_action(pai_system, "Sravan", "POSITIVE_COMMENT", user_type=COMMON,
+                       target_user_name="Kavita", target_user_type=ADVERTISER)
+    handle_user_action(pai_system, "Sravan", "FOLLOWED_USER", user_type=COMMON,
+                       target_user_name="Kavita", target_user_type=ADVERTISER)
     pai_system.print_user_status("Kavita")
     pai_system.print_user_status("Sravan")
 
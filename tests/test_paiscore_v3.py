@@ -0,0 +1,25 @@
+"""Tests for PaiScoreV3. Run with python -m unittest discover tests."""
+import unittest
+
+from PaiScoreV3 import PaiSystem
+
+class BadgeBoundaryTest(unittest.TestCase):
+    def badge_name(self, score):
+        return PaiSystem()._get_badge_for_score(score)["name"]
+
+    def test_fractional_score_below_a_tier_keeps_the_lower_badge(self):
+        self.assertEqual(self.badge_name(29.99), "New")
+
+    def test_tier_minimum_reaches_the_next_badge(self):
+        self.assertEqual(self.badge_name(30), "Explorer")
+
+    def test_every_tier_boundary(self):
+        for score, name in [
+            (0, "New"), (59.99, "Explorer"), (60, "Trusted"), (79.99, "Trusted"),
+            (80, "Elite"), (94.99, "Elite"), (95, "Ambassador"), (100, "Ambassador"),
+        ]:
+            with self.subTest(score=score):
+                self.assertEqual(self.badge_name(score), name)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+"""Tests for PaiScoreV4. Run with python -m unittest discover tests."""
+import datetime
+import unittest
+
+from PaiScoreV4 import MAX_HISTORY_DAYS, PaiSystem, handle_user_action
+
+START_DATE = datetime.date(2025, 1, 1)
+CREATION_DATE = datetime.date(2023, 6, 1)
+USER_TYPES = {"Asha": "common", "Vikram": "common", "Ravi": "advertiser", "Meena": "advertiser"}
+
+# Cached buckets are decayed forward by rescaling, a rebuild rounds every action's decay
+# power to fixed point; the two agree to well within the two decimals that are reported
+SCORE_PLACES = 2
+
+# A script is a list of steps: an int advances the clock that many days, a tuple
+# (user, action type, days back, target user or None) registers one action. Positive
+# days back date the action in the past, negative ones in the future.
+MIXED_SCRIPT = [
+    ("Asha", "LOGIN", 0, None),
+    ("Ravi", "AD_POSTED_MONEY", 0, None),
+    ("Asha", "AD_LIKED", 0, "Ravi"),
+    1,
+    ("Vikram", "POSITIVE_COMMENT", 0, "Ravi"),
+    ("Meena", "AD_POSTED_PAI", 0, None),
+    ("Asha", "AD_SHARED", 2, "Meena"),
+    3,
+    ("Ravi", "AD_BLOCKED", 0, None),
+    ("Vikram", "ADDED_TO_FAVOURITES", 1, "Meena"),
+    ("Asha", "AD_REPORTED", 0, None),
+    7,
+    ("Meena", "RESPONDED_TO_REVIEW", 0, "Ravi"),
+    ("Vikram", "VISITED_PROFILE", 5, "Ravi"),
+    ("Asha", "VERIFIED_PROFILE", 0, None),
+    2,
+    ("Ravi", "GAINED_FOLLOWER", 0, None),
+    ("Asha", "FOLLOWED_USER", 0, "Vikram"),
+    12,
+    ("Meena", "REPORTED_ADVERTISER", 0, None),
+    ("Vikram", "AD_VISITED", 0, "Meena"),
+    9,
+    ("Asha", "GAVE_RATING", 0, None),
+    ("Ravi", "RECEIVED_RATING", 3, None),
+    20,
+    ("Vikram", "LOGIN", 0, None),
+    1,
+]
+
+# Actions dated into the past, some already outside the 30-day history window
+BACKDATED_SCRIPT = [
+    ("Ravi", "AD_POSTED_MONEY", 0, None),
+    ("Asha", "AD_LIKED", 5, "Ravi"),
+    ("Vikram", "POSITIVE_COMMENT", 29, "Ravi"),
+    ("Asha", "AD_REPORTED", 40, None),
+    2,
+    ("Ravi", "GAINED_FOLLOWER", 31, None),
+    ("Meena", "AD_POSTED_FREE", 12, None),
+    ("Vikram", "AD_SHARED", 1, "Meena"),
+    4,
+    ("Asha", "LOGIN", 27, None),
+    ("Meena", "AD_BLOCKED", 3, None),
+    25,
+    ("Ravi", "RECEIVED_RATING", 20, None),
+    3,
+]
+
+# Actions dated into the future, which only count from their date onwards
+FUTURE_DATED_SCRIPT = [
+    ("Asha", "LOGIN", 0, None),
+    ("Ravi", "AD_POSTED_PAI", -3, None),
+    ("Asha", "AD_LIKED", -5, "Ravi"),
+    1,
+    ("Vikram", "ADDED_TO_FAVOURITES", -1, "Meena"),
+    ("Meena", "AD_POSTED_MONEY", 0, None),
+    2,
+    ("Ravi", "AD_BLOCKED", -10, None),
+    ("Vikram", "LOGIN", 0, None),
+    4,
+    ("Asha", "VERIFIED_PROFILE", -2, None),
+    6,
+    ("Meena", "RESPONDED_TO_REVIEW", 0, "Ravi"),
+    5,
+]
+
+# Clock jumps longer than the 30-day history window, one past MAX_HISTORY_DAYS
+CLOCK_JUMP_SCRIPT = [
+    ("Asha", "AD_SHARED", 0, "Ravi"),
+    ("Ravi", "AD_POSTED_MONEY", 0, None),
+    ("Vikram", "AD_VISITED", 0, "Meena"),
+    45,
+    ("Meena", "AD_POSTED_PAI", 0, None),
+    ("Asha", "LOGIN", 10, None),
+    31,
+    ("Ravi", "REPORTED_ADVERTISER", 0, None),
+    ("Vikram", "FOLLOWED_USER", 2, "Asha"),
+    400,
+    ("Meena", "GAINED_FOLLOWER", 0, None),
+    ("Asha", "GAVE_RATING", -2, None),
+    60,
+    ("Vikram", "LOGIN", 0, None),
+    1,
+]
+
+class RebuildingPaiSystem(PaiSystem):
+    """A PaiSystem that never reuses cached buckets, so every score comes from a rebuild."""
+    def _score_cache_is_usable(self, user, current_ord):
+        return False
+
+class PerUserPaiSystem(PaiSystem):
+    """A PaiSystem that rescores every user through update_user_score instead of in one batch."""
+    def update_all_scores(self):
+        for user_name in self.users:
+            self.update_user_score(user_name)
+
+def new_system(system_class=PaiSystem):
+    pai_system = system_class()
+    pai_system.current_date = START_DATE
+    return pai_system
+
+def play_step(pai_system, step):
+    if isinstance(step, int):
+        pai_system.advance_time(step)
+        return
+    user_name, action_type, days_back, target_user_name = step
+    handle_user_action(
+        pai_system, user_name, action_type, user_type=USER_TYPES[user_name],
+        action_date=pai_system.current_date - datetime.timedelta(days=days_back),
+        creation_date=CREATION_DATE, target_user_name=target_user_name,
+        target_user_type=USER_TYPES.get(target_user_name), target_creation_date=CREATION_DATE,
+    )
+
+class ScoreCacheTest(unittest.TestCase):
+    def assertScoresMatch(self, pai_system, reference, step):
+        for name, user in reference.users.items():
+            self.assertAlmostEqual(
+                pai_system.users[name].score, user.score, places=SCORE_PLACES,
+                msg=f"{name} after step {step!r}",
+            )
+
+    def assertScoringPathsAgree(self, script):
+        # The batch update, the per-user cached path and full rebuilds, run in lockstep
+        batch, per_user = new_system(), new_system(PerUserPaiSystem)
+        rebuilt = new_system(RebuildingPaiSystem)
+        for step in script:
+            for pai_system in (batch, per_user, rebuilt):
+                play_step(pai_system, step)
+            self.assertScoresMatch(batch, rebuilt, step)
+            self.assertScoresMatch(per_user, rebuilt, step)
+
+    def test_cached_score_matches_rebuild(self):
+        self.assertScoringPathsAgree(MIXED_SCRIPT)
+
+    def test_scoring_paths_agree_on_backdated_actions(self):
+        self.assertScoringPathsAgree(BACKDATED_SCRIPT)
+
+    def test_scoring_paths_agree_on_future_dated_actions(self):
+        self.assertScoringPathsAgree(FUTURE_DATED_SCRIPT)
+
+    def test_scoring_paths_agree_across_clock_jumps(self):
+        self.assertScoringPathsAgree(CLOCK_JUMP_SCRIPT)
+
+class HistoryDaysTest(unittest.TestCase):
+    def test_rejects_windows_past_max_history_days(self):
+        with self.assertRaises(ValueError):
+            PaiSystem(history_days=MAX_HISTORY_DAYS + 1)
+
+    def test_rejects_reassignment_past_max_history_days(self):
+        pai_system = PaiSystem(history_days=MAX_HISTORY_DAYS)
+        with self.assertRaises(ValueError):
+            pai_system.history_days = MAX_HISTORY_DAYS + 1
+        self.assertEqual(pai_system.history_days, MAX_HISTORY_DAYS)
+
+if __name__ == "__main__":
+    unittest.main()